@@ -1,165 +1,198 @@
 import os
-import json
 import numpy as np
-import pandas as pd
+import simdjson
+import matplotlib
+matplotlib.use("Agg")  # graphs are only written to files, never shown
 import matplotlib.pyplot as plt
 
+# ---------- DATA LOADING ----------
+
+SUMMARY_DTYPE = [("word", "U5"), ("attempts", "i4"), ("solved", "?")]
+
+
+def load_summary(path):
+    # worldle.py saves a binary copy next to the CSV; use it unless the CSV is newer
+    npy_path = os.path.splitext(path)[0] + ".npy"
+    if os.path.exists(npy_path) and os.path.getmtime(npy_path) >= os.path.getmtime(path):
+        return np.load(npy_path)
+    return np.genfromtxt(path, delimiter=",", skip_header=1, dtype=SUMMARY_DTYPE, encoding="utf-8")
+
+
+def load_detailed_stats(path, sample_size=5):
+    parser = simdjson.Parser()
+    return extract_stats(parser.load(path), sample_size)
+
+
+def extract_stats(detailed, sample_size=5):
+    # One sweep over the logs collects everything the detailed plots need. Only the
+    # per-guess "remaining" counts are read out of each entry; guess strings and the
+    # rest of the document are never turned into Python objects.
+    guess_lengths = []
+    collapse_steps = []
+    lens = []
+    flat = []
+    samples = []
+    for entry in detailed:
+        log = entry.get("guessLog", [])
+        remaining = [step["remaining"] for step in log if "remaining" in step]
+        guess_lengths.append(len(log))
+        lens.append(len(remaining))
+        flat.extend(remaining)
+        for i, val in enumerate(remaining, 1):
+            if val <= 1:
+                collapse_steps.append(i)
+                break
+        if remaining and remaining[0] != 0 and len(samples) < sample_size:
+            samples.append((entry.get("word"), remaining))
+
+    # Ragged rows -> (words, rounds) matrix; rounds a word never reached stay NaN
+    lens = np.array(lens, dtype=np.intp)
+    max_rounds = int(lens.max(initial=0))
+    remaining = np.full((len(lens), max_rounds), np.nan)
+    remaining[np.arange(max_rounds) < lens[:, None]] = flat
+
+    # Pool size relative to the first guess, each row padded with its last value
+    usable = np.flatnonzero((lens > 0) & (remaining[:, :1] != 0).any(axis=1))
+    depth = int(lens[usable].max(initial=0))
+    cols = np.minimum(np.arange(depth), (lens[usable] - 1)[:, None])
+    reductions = remaining[usable[:, None], cols] / remaining[usable, :1]
+
+    return {
+        "guess_lengths": np.array(guess_lengths, dtype=np.intp),
+        "collapse_steps": np.array(collapse_steps, dtype=np.intp),
+        "remaining": remaining,
+        "reductions": reductions,
+        "samples": samples,
+    }
+
+
 # ---------- PLOT FUNCTIONS ----------
 
-def plot_attempt_distribution(df, output_path):
-    plt.figure(figsize=(6, 4))
-    df[df["solved"] == True]["attempts"].hist(
-        bins=range(1, df["attempts"].max() + 2), align='left', rwidth=0.8
-    )
-    plt.title("Distribution of Solve Attempts")
-    plt.xlabel("Attempts")
-    plt.ylabel("Number of Words")
-    plt.xticks(range(1, df["attempts"].max() + 1))
-    plt.tight_layout()
-    plt.savefig(output_path)
+def plot_unit_histogram(ax, values, max_value):
+    # Values are small positive ints, so one bincount replaces hist's bin search;
+    # bars are drawn the way hist(bins=range(1, max_value + 2), align='left', rwidth=0.8) would.
+    counts = np.bincount(values, minlength=max_value + 1)[1:max_value + 1]
+    ax.bar(np.arange(1, max_value + 1), counts, width=0.8)
+
+
+def plot_attempt_distribution(data, output_path):
+    max_attempts = data["attempts"].max()
+    fig, ax = plt.subplots(figsize=(6, 4))
+    plot_unit_histogram(ax, data["attempts"][data["solved"]], max_attempts)
+    ax.grid(True)
+    ax.set_title("Distribution of Solve Attempts")
+    ax.set_xlabel("Attempts")
+    ax.set_ylabel("Number of Words")
+    ax.set_xticks(range(1, max_attempts + 1))
+    fig.tight_layout()
+    fig.savefig(output_path)
+    plt.close(fig)
     print(f"✅ Saved: {os.path.basename(output_path)}")
 
 
-def plot_top_hardest_words(df, output_path, top_n=20):
-    top = df.sort_values("attempts", ascending=False).head(top_n)
-    plt.figure(figsize=(10, 5))
-    plt.bar(top["word"], top["attempts"], color='orange')
-    plt.title(f"Top {top_n} Hardest Words")
-    plt.ylabel("Attempts")
-    plt.xticks(rotation=45)
-    plt.tight_layout()
-    plt.savefig(output_path)
+def plot_top_hardest_words(data, output_path, top_n=20):
+    top = data[np.argsort(-data["attempts"], kind="stable")[:top_n]]
+    fig, ax = plt.subplots(figsize=(10, 5))
+    ax.bar(top["word"], top["attempts"], color='orange')
+    ax.set_title(f"Top {top_n} Hardest Words")
+    ax.set_ylabel("Attempts")
+    ax.tick_params(axis='x', labelrotation=45)
+    fig.tight_layout()
+    fig.savefig(output_path)
+    plt.close(fig)
     print(f"✅ Saved: {os.path.basename(output_path)}")
 
 
-def plot_guess_length_histogram(detailed, output_path):
-    guess_lengths = [len(entry.get("guessLog", [])) for entry in detailed]
-    plt.figure(figsize=(6, 4))
-    plt.hist(guess_lengths, bins=range(1, max(guess_lengths) + 2), align='left', rwidth=0.8)
-    plt.title("Total Guesses per Word (Solved + Failed)")
-    plt.xlabel("Number of Guesses")
-    plt.ylabel("Word Count")
-    plt.tight_layout()
-    plt.savefig(output_path)
+def plot_guess_length_histogram(guess_lengths, output_path):
+    fig, ax = plt.subplots(figsize=(6, 4))
+    plot_unit_histogram(ax, guess_lengths, guess_lengths.max())
+    ax.set_title("Total Guesses per Word (Solved + Failed)")
+    ax.set_xlabel("Number of Guesses")
+    ax.set_ylabel("Word Count")
+    fig.tight_layout()
+    fig.savefig(output_path)
+    plt.close(fig)
     print(f"✅ Saved: {os.path.basename(output_path)}")
 
 
-def plot_avg_candidates_per_guess(detailed, output_path):
-    valid_steps = []
-    for entry in detailed:
-        for i, step in enumerate(entry.get("guessLog", [])):
-            if isinstance(step, dict) and "remaining" in step:
-                if len(valid_steps) <= i:
-                    valid_steps.append([])
-                valid_steps[i].append(step["remaining"])
-
-    if valid_steps:
-        avg_remaining = [np.mean(step) for step in valid_steps]
-        plt.figure(figsize=(8, 4))
-        plt.plot(range(1, len(avg_remaining) + 1), avg_remaining, marker='o')
-        plt.title("Average Remaining Candidate Words per Guess Round (Log Scale)")
-        plt.xlabel("Guess Number")
-        plt.ylabel("Average Remaining Words")
-        plt.yscale("log")
-        plt.grid(True)
-        plt.tight_layout()
-        plt.savefig(output_path)
+def plot_avg_candidates_per_guess(remaining, output_path):
+    if remaining.shape[1]:
+        # nanmean averages each round over only the words that got that far
+        avg_remaining = np.nanmean(remaining, axis=0)
+        fig, ax = plt.subplots(figsize=(8, 4))
+        ax.plot(range(1, len(avg_remaining) + 1), avg_remaining, marker='o')
+        ax.set_title("Average Remaining Candidate Words per Guess Round (Log Scale)")
+        ax.set_xlabel("Guess Number")
+        ax.set_ylabel("Average Remaining Words")
+        ax.set_yscale("log")
+        ax.grid(True)
+        fig.tight_layout()
+        fig.savefig(output_path)
+        plt.close(fig)
         print(f"✅ Saved: {os.path.basename(output_path)}")
     else:
         print(f"⚠️ Skipped: {os.path.basename(output_path)} (no 'remaining' data)")
 
 
-def plot_sample_pool_reduction(detailed, output_path, sample_size=5):
-    plt.figure(figsize=(8, 4))
-    sampled = 0
-    for entry in detailed:
-        log = entry.get("guessLog", [])
-        if log and "remaining" in log[0]:
-            start = log[0]["remaining"]
-            if start == 0:
-                continue
-            reductions = [step["remaining"] / start for step in log if "remaining" in step]
-            plt.plot(range(1, len(reductions) + 1), reductions, label=entry["word"])
-            sampled += 1
-        if sampled >= sample_size:
-            break
-
-    if sampled > 0:
-        plt.title("Candidate Pool Reduction (Sample Words, % of Start)")
-        plt.xlabel("Guess")
-        plt.ylabel("Remaining Candidates (% of first)")
-        plt.yscale("log")
-        plt.legend()
-        plt.grid(True)
-        plt.tight_layout()
-        plt.savefig(output_path)
+def plot_sample_pool_reduction(samples, output_path):
+    fig, ax = plt.subplots(figsize=(8, 4))
+    for word, remaining in samples:
+        reductions = [r / remaining[0] for r in remaining]
+        ax.plot(range(1, len(reductions) + 1), reductions, label=word)
+
+    if samples:
+        ax.set_title("Candidate Pool Reduction (Sample Words, % of Start)")
+        ax.set_xlabel("Guess")
+        ax.set_ylabel("Remaining Candidates (% of first)")
+        ax.set_yscale("log")
+        ax.legend()
+        ax.grid(True)
+        fig.tight_layout()
+        fig.savefig(output_path)
         print(f"✅ Saved: {os.path.basename(output_path)}")
     else:
         print(f"⚠️ Skipped: {os.path.basename(output_path)} (no usable data)")
-
-
-def plot_collapse_steps_histogram(detailed, output_path):
-    collapse_steps = []
-    for entry in detailed:
-        reductions = [step["remaining"] for step in entry.get("guessLog", []) if "remaining" in step]
-        if reductions:
-            for i, val in enumerate(reductions):
-                if val <= 1:
-                    collapse_steps.append(i + 1)
-                    break
-
-    if collapse_steps:
-        plt.figure(figsize=(6, 4))
-        plt.hist(collapse_steps, bins=range(1, max(collapse_steps) + 2), align='left', rwidth=0.8)
-        plt.title("Guesses Until Only 1 Candidate Remained")
-        plt.xlabel("Guess Number")
-        plt.ylabel("Word Count")
-        plt.tight_layout()
-        plt.savefig(output_path)
+    plt.close(fig)
+
+
+def plot_collapse_steps_histogram(collapse_steps, output_path):
+    if collapse_steps.size:
+        fig, ax = plt.subplots(figsize=(6, 4))
+        plot_unit_histogram(ax, collapse_steps, collapse_steps.max())
+        ax.set_title("Guesses Until Only 1 Candidate Remained")
+        ax.set_xlabel("Guess Number")
+        ax.set_ylabel("Word Count")
+        fig.tight_layout()
+        fig.savefig(output_path)
+        plt.close(fig)
         print(f"✅ Saved: {os.path.basename(output_path)}")
     else:
         print(f"⚠️ Skipped: {os.path.basename(output_path)} (no valid collapse data)")
 
 
-def plot_avg_pool_reduction_only(detailed, output_path):
-    all_reductions = []
-    max_depth = 0
-
-    for entry in detailed:
-        log = entry.get("guessLog", [])
-        if log and isinstance(log[0], dict) and "remaining" in log[0]:
-            start = log[0]["remaining"]
-            if start == 0:
-                continue
-            path = [step["remaining"] / start for step in log if "remaining" in step]
-            max_depth = max(max_depth, len(path))
-            all_reductions.append(path)
-
-    if not all_reductions:
+def plot_avg_pool_reduction_only(reductions, output_path):
+    if not reductions.shape[0]:
         print(f"⚠️ Skipped: {os.path.basename(output_path)} (no usable data)")
         return
 
-    for i in range(len(all_reductions)):
-        last_val = all_reductions[i][-1]
-        all_reductions[i] += [last_val] * (max_depth - len(all_reductions[i]))
-
-    all_reductions = np.array(all_reductions)
-    avg = np.mean(all_reductions, axis=0)
-    std = np.std(all_reductions, axis=0)
+    avg = reductions.mean(axis=0)
+    std = reductions.std(axis=0)
+    max_depth = reductions.shape[1]
 
     x = range(1, max_depth + 1)
 
-    plt.figure(figsize=(8, 4))
-    plt.plot(x, avg, color='blue', label='Average Pool Reduction', linewidth=2)
-    plt.fill_between(x, avg - std, avg + std, color='blue', alpha=0.2, label='±1 Std Dev')
-    plt.title("Average Normalized Pool Reduction (Log Scale)")
-    plt.xlabel("Guess Number")
-    plt.ylabel("Remaining Candidates (% of Start)")
-    plt.yscale("log")
-    plt.grid(True)
-    plt.legend()
-    plt.tight_layout()
-    plt.savefig(output_path)
+    fig, ax = plt.subplots(figsize=(8, 4))
+    ax.plot(x, avg, color='blue', label='Average Pool Reduction', linewidth=2)
+    ax.fill_between(x, avg - std, avg + std, color='blue', alpha=0.2, label='±1 Std Dev')
+    ax.set_title("Average Normalized Pool Reduction (Log Scale)")
+    ax.set_xlabel("Guess Number")
+    ax.set_ylabel("Remaining Candidates (% of Start)")
+    ax.set_yscale("log")
+    ax.grid(True)
+    ax.legend()
+    fig.tight_layout()
+    fig.savefig(output_path)
+    plt.close(fig)
     print(f"✅ Saved: {os.path.basename(output_path)}")
 
 
@@ -174,19 +207,18 @@ def main():
     os.makedirs(graph_dir, exist_ok=True)
 
     print(f"📄 Loading {summary_csv}...")
-    df = pd.read_csv(summary_csv)
+    summary = load_summary(summary_csv)
 
     print(f"📄 Loading {details_json}...")
-    with open(details_json) as f:
-        detailed = json.load(f)
-
-    plot_attempt_distribution(df, os.path.join(graph_dir, "attempt_distribution.png"))
-    plot_top_hardest_words(df, os.path.join(graph_dir, "top20_hardest_words.png"))
-    plot_guess_length_histogram(detailed, os.path.join(graph_dir, "guess_length_histogram.png"))
-    plot_avg_candidates_per_guess(detailed, os.path.join(graph_dir, "avg_candidates_per_guess.png"))
-    plot_sample_pool_reduction(detailed, os.path.join(graph_dir, "sample_pool_reduction.png"))
-    plot_collapse_steps_histogram(detailed, os.path.join(graph_dir, "collapse_steps_histogram.png"))
-    plot_avg_pool_reduction_only(detailed, os.path.join(graph_dir, "avg_pool_reduction.png"))
+    stats = load_detailed_stats(details_json)
+
+    plot_attempt_distribution(summary, os.path.join(graph_dir, "attempt_distribution.png"))
+    plot_top_hardest_words(summary, os.path.join(graph_dir, "top20_hardest_words.png"))
+    plot_guess_length_histogram(stats["guess_lengths"], os.path.join(graph_dir, "guess_length_histogram.png"))
+    plot_avg_candidates_per_guess(stats["remaining"], os.path.join(graph_dir, "avg_candidates_per_guess.png"))
+    plot_sample_pool_reduction(stats["samples"], os.path.join(graph_dir, "sample_pool_reduction.png"))
+    plot_collapse_steps_histogram(stats["collapse_steps"], os.path.join(graph_dir, "collapse_steps_histogram.png"))
+    plot_avg_pool_reduction_only(stats["reductions"], os.path.join(graph_dir, "avg_pool_reduction.png"))
 
     print("\n📊 All graphs saved to 'graphs/'")
 
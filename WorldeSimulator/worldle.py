@@ -1,102 +1,180 @@
 import urllib.request
-from collections import Counter
 import matplotlib.pyplot as plt
 import numpy as np
-import csv
-import json
+import orjson
+import tempfile
+from numba import get_num_threads, njit, prange
+
+MAX_ATTEMPTS = 12
+
+WORDS_CACHE = "words.npy"
+
+# Feedback patterns: one base-3 digit per position (0 gray, 1 yellow, 2 green),
+# position 0 least significant, so 3**5 = 243 patterns fit in a uint8.
+ALL_GREEN = 242
+
+# The (N, N) pattern table is held in RAM up to this size, beyond it in a temp-file memmap
+PATTERN_TABLE_MAX_BYTES = 512 * 1024 * 1024
+
+# simulate_game_stats outcomes
+SOLVED, GAVE_UP = range(2)
+
+SUMMARY_DTYPE = [("word", "U5"), ("attempts", "i4"), ("solved", "?")]
 
 # --- Load Official Wordle Answer List ---
-def load_wordle_words():
-    url = "https://raw.githubusercontent.com/tabatkins/wordle-list/main/words"
-    response = urllib.request.urlopen(url)
-    return [line.decode("utf-8").strip() for line in response if len(line.decode("utf-8").strip()) == 5]
+# The list is downloaded once and cached as encoded letter ids; the strings are
+# rebuilt from the cache and only used for display and output files.
+def load_wordle_words(cache_path=WORDS_CACHE):
+    try:
+        words_u8 = np.load(cache_path)
+    except FileNotFoundError:
+        url = "https://raw.githubusercontent.com/tabatkins/wordle-list/main/words"
+        response = urllib.request.urlopen(url)
+        words = [line.decode("utf-8").strip() for line in response if len(line.decode("utf-8").strip()) == 5]
+        words_u8 = encode_words(words)
+        np.save(cache_path, words_u8)
+    return decode_words(words_u8), words_u8
+
+# --- Word Encoding ---
+# words_u8[n, i] is the letter id (0..25) at position i of word n.
+def encode_words(words):
+    return np.frombuffer(''.join(words).encode(), dtype=np.uint8).reshape(-1, 5) - 97
+
+def decode_words(words_u8):
+    return (words_u8 + 97).view('S5').ravel().astype(str).tolist()
+
+# unique_letters[n, c] is True when letter c occurs anywhere in word n
+def get_unique_letters(words_u8):
+    unique_letters = np.zeros((words_u8.shape[0], 26), dtype=bool)
+    unique_letters[np.arange(words_u8.shape[0])[:, None], words_u8] = True
+    return unique_letters
+
+# Packed ids (letters read as base-26 digits, first letter most significant) of every
+# bigram (N, 4) and trigram (N, 3); shared by the n-gram counts and word scoring.
+def get_ngram_ids(words_u8):
+    u8 = words_u8.astype(np.int32)
+    bigram_ids = u8[:, :-1] * 26 + u8[:, 1:]
+    trigram_ids = bigram_ids[:, :-1] * 26 + u8[:, 2:]
+    return bigram_ids, trigram_ids
 
 # --- Frequency Analysis ---
-def get_letter_probs(words):
-    all_letters = ''.join(words)
-    counts = Counter(all_letters)
-    total = sum(counts.values())
-    return {ch: count / total for ch, count in counts.items()}
-
-def get_ngram_probs(words, n):
-    ngrams = Counter()
-    for word in words:
-        for i in range(len(word) - n + 1):
-            ngrams[word[i:i+n]] += 1
-    total = sum(ngrams.values())
-    return {ng: count / total for ng, count in ngrams.items()}
-
-def get_positional_probs(words):
-    pos_counts = [Counter() for _ in range(5)]
-    for word in words:
-        for i, ch in enumerate(word):
-            pos_counts[i][ch] += 1
-    probs = []
-    for counter in pos_counts:
-        total = sum(counter.values())
-        probs.append({ch: count / total for ch, count in counter.items()})
-    return probs
+# Probabilities are dense arrays indexed by letter id, or by packed n-gram id.
+def get_letter_probs(words_u8):
+    counts = np.bincount(words_u8.ravel(), minlength=26)
+    return counts / counts.sum()
+
+def get_ngram_probs(ngram_ids, n):
+    counts = np.bincount(ngram_ids.ravel(), minlength=26 ** n)
+    return counts / counts.sum()
+
+def get_positional_probs(words_u8):
+    pos_counts = np.stack([np.bincount(words_u8[:, i], minlength=26) for i in range(5)])
+    return pos_counts / pos_counts.sum(axis=1, keepdims=True)
 
 # --- Feedback Simulation ---
+# Words are packed into one int64 with letter i in byte i (int64 rather than uint64 so
+# numba never mixes signed and unsigned operands into float arithmetic).
+BYTE_LOW7 = 0x7F7F7F7F7F
+BYTE_HIGH = 0x8080808080
+
+def pack_words(words_u8):
+    return (words_u8.astype(np.int64) << (8 * np.arange(5))).sum(axis=1)
+
+# Standard two-pass Wordle coloring: greens first, then a letter is yellow only while
+# the target still has unmatched copies of it left over. Greens come from a SWAR
+# zero-byte test on guess ^ actual; when the guess has no repeated letter outside the
+# greens, yellows are a single lookup in the bitmask of the target's unmatched letters.
+@njit(cache=True)
 def get_feedback(guess, actual):
-    green = {}
-    yellow = []
-    gray = set()
-    for i, ch in enumerate(guess):
-        if ch == actual[i]:
-            green[i] = ch
-        elif ch in actual:
-            if guess.count(ch) <= actual.count(ch):
-                yellow.append((ch, i))
-            else:
-                gray.add(ch)
+    diff = guess ^ actual
+    # high bit of byte i is set iff letter i differs; adding 0x7F to the low 7 bits
+    # can't carry into the next byte, so this is exact (unlike the borrow-based test)
+    differs = (((diff & BYTE_LOW7) + BYTE_LOW7) | diff) & BYTE_HIGH
+
+    unmatched = 0
+    guess_seen = 0
+    repeated = 0
+    for i in range(5):
+        if (differs >> (8 * i + 7)) & 1:
+            unmatched |= 1 << ((actual >> (8 * i)) & 0xFF)
+            bit = 1 << ((guess >> (8 * i)) & 0xFF)
+            repeated |= guess_seen & bit
+            guess_seen |= bit
+
+    pattern = 0
+    power = 1
+    for i in range(5):
+        if not (differs >> (8 * i + 7)) & 1:
+            pattern += 2 * power
+        elif repeated == 0:
+            pattern += power * ((unmatched >> ((guess >> (8 * i)) & 0xFF)) & 1)
         else:
-            gray.add(ch)
-    return green, yellow, gray
+            ch = (guess >> (8 * i)) & 0xFF
+            left = 0
+            seen = 0
+            for j in range(5):
+                if (differs >> (8 * j + 7)) & 1:
+                    if ((actual >> (8 * j)) & 0xFF) == ch:
+                        left += 1
+                    if j < i and ((guess >> (8 * j)) & 0xFF) == ch:
+                        seen += 1
+            if seen < left:
+                pattern += power
+        power *= 3
+    return pattern
+
+@njit(parallel=True, cache=True)
+def pattern_rows(packed, start, stop):
+    n_words = packed.shape[0]
+    rows = np.empty((stop - start, n_words), dtype=np.uint8)
+    for g in prange(start, stop):
+        guess = packed[g]
+        for t in range(n_words):
+            rows[g - start, t] = get_feedback(guess, packed[t])
+    return rows
+
+# patterns[g, t] is the feedback guess g receives against target t
+def build_pattern_table(words_u8, chunk_rows=1024):
+    packed = pack_words(words_u8)
+    n_words = packed.shape[0]
+    if n_words * n_words <= PATTERN_TABLE_MAX_BYTES:
+        patterns = np.empty((n_words, n_words), dtype=np.uint8)
+    else:
+        patterns = np.memmap(tempfile.TemporaryFile(), dtype=np.uint8, mode='w+', shape=(n_words, n_words))
+    for start in range(0, n_words, chunk_rows):
+        stop = min(start + chunk_rows, n_words)
+        patterns[start:stop] = pattern_rows(packed, start, stop)
+    return patterns
 
 # --- Word Filtering ---
-def filter_words(words, green=None, yellow=None, gray=None):
-    green = green or {}
-    yellow = yellow or []
-    gray = gray or set()
-    filtered = []
-
-    for word in words:
-        valid = True
-
-        for pos, char in green.items():
-            if word[pos] != char:
-                valid = False
-                break
-        if not valid:
-            continue
-
-        for char, pos in yellow:
-            if char not in word or word[pos] == char:
-                valid = False
-                break
-        if not valid:
-            continue
-
-        for char in gray:
-            if char in word and char not in green.values() and all(char != y[0] for y in yellow):
-                valid = False
-                break
-        if not valid:
-            continue
-
-        filtered.append(word)
-
-    return filtered
+# Keeps the candidates that would have produced the observed pattern for this guess.
+# Compacts the surviving word ids to the front of candidates[:n_alive], keeping their
+# order, and returns how many survived.
+@njit(cache=True)
+def filter_candidates(pattern_row, observed, candidates, n_alive):
+    kept = 0
+    for k in range(n_alive):
+        n = candidates[k]
+        if pattern_row[n] == observed:
+            candidates[kept] = n
+            kept += 1
+    return kept
 
 # --- Word Scoring ---
-def score_word(word, letter_probs, bigram_probs, trigram_probs, pos_probs, weights):
-    unique_letters = set(word)
-    repeat_penalty = weights['repeat_penalty'] if len(unique_letters) < 5 else 1.0
-    letter_score = sum(letter_probs.get(c, 0) for c in unique_letters)
-    bigram_score = sum(bigram_probs.get(word[i:i+2], 0) for i in range(4))
-    trigram_score = sum(trigram_probs.get(word[i:i+3], 0) for i in range(3))
-    position_score = sum(pos_probs[i].get(word[i], 0) for i in range(5))
+# Scores every word at once by gathering from float32 lookup tables; letters
+# repeated within a word only count once towards the letter score.
+def score_words(words_u8, unique_letters, bigram_ids, trigram_ids,
+                letter_probs, bigram_probs, trigram_probs, pos_probs, weights):
+    letter_lut = letter_probs.astype(np.float32)
+    bigram_lut = bigram_probs.astype(np.float32)
+    trigram_lut = trigram_probs.astype(np.float32)
+    pos_lut = pos_probs.astype(np.float32)
+
+    repeat_penalty = np.where(unique_letters.sum(axis=1) < 5, weights['repeat_penalty'], 1.0).astype(np.float32)
+    letter_score = unique_letters @ letter_lut
+    bigram_score = bigram_lut[bigram_ids].sum(axis=1)
+    trigram_score = trigram_lut[trigram_ids].sum(axis=1)
+    position_score = pos_lut[np.arange(5), words_u8].sum(axis=1)
     return repeat_penalty * (
         weights['letter'] * letter_score +
         weights['bigram'] * bigram_score +
@@ -105,59 +183,70 @@ def score_word(word, letter_probs, bigram_probs, trigram_probs, pos_probs, weigh
     )
 
 # --- Game Simulation ---
-def simulate_game_stats(target_word, word_list, weights, letter_probs, bigram_probs, trigram_probs, pos_probs):
-    if target_word not in word_list:
-        print(f"⚠️ Target word '{target_word}' is not in the list. Skipping.")
-        return None, []
-
-    green, yellow, gray = {}, [], set()
+# Plays target_idx to completion, writing each guess and the candidate count it was
+# picked from into guesses/remaining. score_order lists word ids best-first; guesses
+# never match their own pattern unless solved, so the best survivor is always new.
+# candidates is caller-owned scratch the size of score_order, reused across games.
+# Returns (outcome, guesses made).
+@njit(cache=True)
+def simulate_game_stats(target_idx, patterns, score_order, candidates, guesses, remaining):
+    candidates[:] = score_order
+    n_alive = candidates.shape[0]
     attempts = 0
-    max_attempts = 12
-    possible_words = word_list.copy()
-    used_guesses = set()
-    guess_log = []
 
     while True:
-        if not possible_words:
-            print(f"\n❌ '{target_word}': no possible words left after filtering.")
-            return None, guess_log
-
-        scored = [
-            w for w in sorted(possible_words, key=lambda w: score_word(w, letter_probs, bigram_probs, trigram_probs, pos_probs, weights), reverse=True)
-            if w not in used_guesses
-        ]
-
-        if not scored:
-            print(f"\n❌ '{target_word}': No new candidates after filtering.")
-            return None, guess_log
-
-        guess = scored[0]
-        used_guesses.add(guess)
+        guess_idx = candidates[0]
+        guesses[attempts] = guess_idx
+        remaining[attempts] = n_alive
         attempts += 1
-        guess_log.append((guess, len(possible_words)))
-
-        if guess == target_word:
-            return attempts, guess_log
 
-        if attempts >= max_attempts:
-            print(f"\n❌ Gave up on '{target_word}' after {max_attempts} attempts.")
-            return None, guess_log
-
-        g, y, r = get_feedback(guess, target_word)
-        green.update(g)
-        yellow += y
-        gray.update(r)
-        possible_words = filter_words(possible_words, green, yellow, gray)
+        observed = patterns[guess_idx, target_idx]
+        if observed == ALL_GREEN:
+            return SOLVED, attempts
+
+        if attempts >= MAX_ATTEMPTS:
+            return GAVE_UP, attempts
+
+        n_alive = filter_candidates(patterns[guess_idx], observed, candidates, n_alive)
+
+# Plays every target in parallel; row k of guesses/remaining is the log for target_ids[k].
+# Targets are split into one contiguous block per worker so each worker allocates its
+# candidate scratch once instead of once per game.
+@njit(parallel=True, cache=True)
+def run_all(target_ids, patterns, score_order, n_workers):
+    n_targets = target_ids.shape[0]
+    outcomes = np.empty(n_targets, dtype=np.int8)
+    attempts = np.empty(n_targets, dtype=np.int8)
+    guesses = np.zeros((n_targets, MAX_ATTEMPTS), dtype=np.int32)
+    remaining = np.zeros((n_targets, MAX_ATTEMPTS), dtype=np.int32)
+    n_workers = min(n_workers, n_targets)
+    for w in prange(n_workers):
+        candidates = np.empty_like(score_order)
+        for k in range(w * n_targets // n_workers, (w + 1) * n_targets // n_workers):
+            outcome, n = simulate_game_stats(target_ids[k], patterns, score_order, candidates, guesses[k], remaining[k])
+            outcomes[k] = outcome
+            attempts[k] = n
+    return outcomes, attempts, guesses, remaining
+
+def unpack_game(target_word, word_list, outcome, attempts, guesses, remaining):
+    guess_log = [(word_list[guesses[i]], int(remaining[i])) for i in range(attempts)]
+
+    if outcome == SOLVED:
+        return int(attempts), guess_log
+    print(f"\n❌ Gave up on '{target_word}' after {MAX_ATTEMPTS} attempts.")
+    return None, guess_log
 
 # --- Main Execution ---
 if __name__ == "__main__":
     print("🔁 Loading official Wordle answer list...")
-    word_list = load_wordle_words()
+    word_list, words_u8 = load_wordle_words()
+    unique_letters = get_unique_letters(words_u8)
+    bigram_ids, trigram_ids = get_ngram_ids(words_u8)
 
-    letter_probs = get_letter_probs(word_list)
-    bigram_probs = get_ngram_probs(word_list, 2)
-    trigram_probs = get_ngram_probs(word_list, 3)
-    pos_probs = get_positional_probs(word_list)
+    letter_probs = get_letter_probs(words_u8)
+    bigram_probs = get_ngram_probs(bigram_ids, 2)
+    trigram_probs = get_ngram_probs(trigram_ids, 3)
+    pos_probs = get_positional_probs(words_u8)
 
     weights = {
         'letter': 1.0,
@@ -167,29 +256,40 @@ if __name__ == "__main__":
         'repeat_penalty': 0.9
     }
 
+    score_vec = score_words(
+        words_u8, unique_letters, bigram_ids, trigram_ids,
+        letter_probs, bigram_probs, trigram_probs, pos_probs, weights
+    )
+    # Scores never change during a game: rank once, best first (ties keep list order)
+    score_order = np.argsort(-score_vec, kind='stable').astype(np.int32)
+
+    print("🧮 Building feedback pattern table...")
+    patterns = build_pattern_table(words_u8)
+
     print("⚙️ Running simulations...")
     sample_words = word_list[:100]  # full set or use [:100] for testing
     results = []
     failed_words = []
-    summary_data = []
     detailed_logs = []
 
+    # sample_words is a prefix of word_list, so its indices are the target ids
+    target_ids = np.arange(len(sample_words), dtype=np.int32)
+    outcomes, game_attempts, game_guesses, game_remaining = run_all(target_ids, patterns, score_order, get_num_threads())
+
     for idx, word in enumerate(sample_words, 1):
         print(f"\n▶️ {idx}/{len(sample_words)}: Testing '{word}'...")
 
-        attempts, guess_log = simulate_game_stats(
-            word, word_list, weights,
-            letter_probs, bigram_probs, trigram_probs, pos_probs
+        k = idx - 1
+        attempts, guess_log = unpack_game(
+            word, word_list, outcomes[k], game_attempts[k], game_guesses[k], game_remaining[k]
         )
 
         if attempts is not None:
             print(f"✅ Solved in {attempts} attempts.")
             results.append((word, attempts))
-            summary_data.append({'word': word, 'attempts': attempts, 'solved': True})
         else:
             print("❌ Failed.")
             failed_words.append(word)
-            summary_data.append({'word': word, 'attempts': len(guess_log), 'solved': False})
 
         detailed_logs.append({
             'word': word,
@@ -199,18 +299,19 @@ if __name__ == "__main__":
         })
 
     # Stats
-    attempt_counts = [a for _, a in results]
-    avg_attempts = np.mean(attempt_counts)
-    max_attempts = np.max(attempt_counts)
-    min_attempts = np.min(attempt_counts)
-    distribution = Counter(attempt_counts)
+    attempt_counts = game_attempts[outcomes == SOLVED].astype(np.int32)
+    avg_attempts = attempt_counts.mean()
+    max_attempts = attempt_counts.max()
+    min_attempts = attempt_counts.min()
+    values, counts = np.unique(attempt_counts, return_counts=True)
+    distribution = {int(v): int(c) for v, c in zip(values, counts)}
 
     print("\n📊 --- Simulation Summary ---")
     print(f"Words tested: {len(results)}")
     print(f"Average attempts: {avg_attempts:.2f}")
     print(f"Min attempts: {min_attempts}")
     print(f"Max attempts: {max_attempts}")
-    print("Attempt distribution:", dict(distribution))
+    print("Attempt distribution:", distribution)
 
     if failed_words:
         print(f"\n❌ {len(failed_words)} words failed:")
@@ -218,13 +319,17 @@ if __name__ == "__main__":
             print(f"  - {word}")
 
     # Save results
-    with open("wordle_summary.csv", "w", newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=["word", "attempts", "solved"])
-        writer.writeheader()
-        writer.writerows(summary_data)
-
-    with open("wordle_detailed_logs.json", "w") as f:
-        json.dump(detailed_logs, f, indent=2)
+    # Failed games record how many guesses were made, which is game_attempts as well
+    summary = np.empty(len(sample_words), dtype=SUMMARY_DTYPE)
+    summary["word"] = sample_words
+    summary["attempts"] = game_attempts
+    summary["solved"] = outcomes == SOLVED
+    np.savetxt("wordle_summary.csv", summary, fmt="%s,%d,%s", header="word,attempts,solved", comments="")
+    # Binary copy for analysis.py, which loads it instead of parsing the CSV
+    np.save("wordle_summary.npy", summary)
+
+    with open("wordle_detailed_logs.json", "wb") as f:
+        f.write(orjson.dumps(detailed_logs, option=orjson.OPT_INDENT_2))
 
     print("\n📁 Results saved to 'wordle_summary.csv' and 'wordle_detailed_logs.json'.")
 